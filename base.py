@@ -1,9 +1,10 @@
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine
-from sqlalchemy.orm import sessionmaker
 from functools import lru_cache
 
+import asyncio
 import config
 
 
@@ -18,6 +19,9 @@ username = get_settings().username
 password = get_settings().password
 database = get_settings().database
 port = get_settings().port
+pool_size = get_settings().pool_size
+max_overflow = get_settings().max_overflow
+statement_cache_size = get_settings().statement_cache_size
 
 
 DATABASE_URL = f'postgresql+asyncpg://{username}:{password}@{host}:{port}/{database}'
@@ -25,5 +29,27 @@ DATABASE_URL = f'postgresql+asyncpg://{username}:{password}@{host}:{port}/{datab
 
 Base = declarative_base()
 
-engine = create_async_engine(DATABASE_URL, echo=True)
-async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# keep warm connections per worker, recycle them before server side timeouts,
+# the api only reads so statements run in autocommit without BEGIN/COMMIT
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=True,
+    isolation_level='AUTOCOMMIT',
+    pool_size=pool_size,
+    max_overflow=max_overflow,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args={
+        # asyncpg keeps the server side prepared statements, sqlalchemy the
+        # prepared statement handles, both sized for every distinct query
+        'statement_cache_size': statement_cache_size,
+        'prepared_statement_cache_size': statement_cache_size
+    }
+)
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def warm_up_pool():
+    # open the pooled connections upfront so first requests skip the connect
+    connections = await asyncio.gather(*(engine.connect() for _ in range(pool_size)))
+    await asyncio.gather(*(connection.close() for connection in connections))
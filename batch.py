@@ -0,0 +1,71 @@
+from urllib.parse import unquote, urlsplit
+
+import asyncio
+import orjson
+
+
+
+async def dispatch(app, item):
+    # runs a GET sub-request through the ASGI app in-process, so it goes
+    # through the same routing, dependencies and middleware as a real one
+    url = urlsplit(item.url)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': item.method,
+        'scheme': 'http',
+        'path': unquote(url.path),
+        'raw_path': url.path.encode(),
+        'root_path': '',
+        'query_string': url.query.encode(),
+        'headers': [(b'host', b'batch')],
+        'client': None,
+        'server': None,
+    }
+
+    done = asyncio.Event()
+    requested = False
+    status = 500
+    headers = {}
+    body = bytearray()
+
+    async def receive():
+        nonlocal requested
+
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        await done.wait()
+
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status, headers
+
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            headers = dict(message.get('headers', []))
+        elif message['type'] == 'http.response.body':
+            body.extend(message.get('body', b''))
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        status = 500
+    finally:
+        done.set()
+
+    content_type = headers.get(b'content-type', b'').decode()
+
+    if body and content_type.endswith('json'):
+        content = orjson.Fragment(bytes(body))
+    else:
+        content = body.decode() or None
+
+    return {'id': item.id, 'status': status, 'body': content}
+
+
+async def dispatch_all(app, items):
+    return await asyncio.gather(*(dispatch(app, item) for item in items))
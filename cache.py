@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from decimal import Decimal
+from sqlalchemy import inspect
+from sqlalchemy.engine import Row
+from typing import Optional
+
+import functools
+import orjson
+import time
+
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            expires, value = self._data[key]
+        except KeyError:
+            return default
+
+        if expires is not None and expires < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+
+        return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+
+        self._data[key] = (expires, value)
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+
+    if isinstance(value, Row):
+        return value._asdict()
+
+    mapper = getattr(inspect(value, raiseerr=False), 'mapper', None)
+
+    if mapper is None:
+        raise TypeError(f'cannot cache {type(value).__name__}')
+
+    return {column.key: getattr(value, column.key) for column in mapper.column_attrs}
+
+
+def memoize(maxsize: int = 128, ttl: Optional[float] = None):
+    # caches async service functions by their arguments, the session or
+    # connection passed first is not part of the key. results are kept as
+    # encoded json so orm rows never outlive their session and every caller
+    # gets its own plain copy, misses are not cached
+    def decorator(function):
+        results = LRUCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(function)
+        async def wrapper(session, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            body = results.get(key)
+
+            if body is None:
+                result = await function(session, *args, **kwargs)
+
+                if result is None:
+                    return None
+
+                body = orjson.dumps(result, default=_default)
+                results.set(key, body)
+
+            return orjson.loads(body)
+
+        wrapper.cache = results
+
+        return wrapper
+
+    return decorator
@@ -9,5 +9,9 @@ class Settings(BaseSettings):
     username: str = Field(validation_alias='DB_USER')
     database: str = Field(validation_alias='DB_NAME')
     port: int = Field(validation_alias='DB_PORT')
+    pool_size: int = Field(10, validation_alias='DB_POOL_SIZE')
+    max_overflow: int = Field(10, validation_alias='DB_MAX_OVERFLOW')
+    statement_cache_size: int = Field(512, validation_alias='DB_STATEMENT_CACHE_SIZE')
+    profiling: bool = Field(False, validation_alias='PROFILING')
 
     model_config = SettingsConfigDict(env_file='.env', populate_by_name=True)
@@ -0,0 +1,13 @@
+-- accidents are looked up by the lowercased name of their municipality,
+-- skipped until the accident data and the municipalities are imported
+DO $$
+BEGIN
+    IF to_regclass('vg250gem') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS vg250gem_lower_gen_idx ON vg250gem (LOWER(gen));
+    END IF;
+
+    IF to_regclass('accidents') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS accidents_ags_idx ON accidents (ags);
+    END IF;
+END
+$$;
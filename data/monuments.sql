@@ -0,0 +1,83 @@
+-- monuments are looked up by object id, keep that an index scan
+CREATE INDEX IF NOT EXISTS monuments_object_id_idx ON monuments (object_id);
+CREATE INDEX IF NOT EXISTS monument_x_reason_monument_id_idx ON monument_x_reason (monument_id);
+
+-- monuments are matched against the municipalities they lie within
+CREATE INDEX IF NOT EXISTS monuments_wkb_geometry_idx ON monuments USING gist (wkb_geometry);
+
+-- geometries rarely change, render their geojson once when a row is written
+ALTER TABLE monuments ADD COLUMN IF NOT EXISTS geojson json GENERATED ALWAYS AS (ST_AsGeoJSON(wkb_geometry)::json) STORED;
+
+-- reason labels are kept on the monument itself and maintained by triggers
+ALTER TABLE monuments ADD COLUMN IF NOT EXISTS reason_labels text[];
+
+CREATE OR REPLACE FUNCTION update_monument_reason_labels(monument_ids int[]) RETURNS void AS $$
+    UPDATE monuments AS m
+    SET reason_labels = (
+        SELECT array_agg(mr.label ORDER BY mr.id)
+        FROM monument_x_reason AS mxr
+
+        JOIN monument_reason AS mr
+        ON mxr.reason_id = mr.id
+
+        WHERE mxr.monument_id = m.id
+    )
+    WHERE m.id = ANY(monument_ids);
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION monument_x_reason_changed() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM update_monument_reason_labels(ARRAY[OLD.monument_id]);
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM update_monument_reason_labels(ARRAY[NEW.monument_id]);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION monument_reason_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM update_monument_reason_labels(ARRAY(
+        SELECT mxr.monument_id
+        FROM monument_x_reason AS mxr
+        WHERE mxr.reason_id = NEW.id
+    ));
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- truncating bypasses the row triggers, rebuild every monument instead
+CREATE OR REPLACE FUNCTION monument_reasons_truncated() RETURNS trigger AS $$
+BEGIN
+    PERFORM update_monument_reason_labels(ARRAY(SELECT id FROM monuments));
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS monument_x_reason_labels_trigger ON monument_x_reason;
+CREATE TRIGGER monument_x_reason_labels_trigger
+AFTER INSERT OR UPDATE OR DELETE ON monument_x_reason
+FOR EACH ROW EXECUTE FUNCTION monument_x_reason_changed();
+
+DROP TRIGGER IF EXISTS monument_reason_labels_trigger ON monument_reason;
+CREATE TRIGGER monument_reason_labels_trigger
+AFTER UPDATE OF label ON monument_reason
+FOR EACH ROW EXECUTE FUNCTION monument_reason_changed();
+
+DROP TRIGGER IF EXISTS monument_x_reason_truncate_trigger ON monument_x_reason;
+CREATE TRIGGER monument_x_reason_truncate_trigger
+AFTER TRUNCATE ON monument_x_reason
+FOR EACH STATEMENT EXECUTE FUNCTION monument_reasons_truncated();
+
+DROP TRIGGER IF EXISTS monument_reason_truncate_trigger ON monument_reason;
+CREATE TRIGGER monument_reason_truncate_trigger
+AFTER TRUNCATE ON monument_reason
+FOR EACH STATEMENT EXECUTE FUNCTION monument_reasons_truncated();
+
+SELECT update_monument_reason_labels(ARRAY(SELECT id FROM monuments));
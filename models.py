@@ -1,4 +1,4 @@
-from sqlalchemy import CheckConstraint, Column, ForeignKey, Index, Integer, Numeric, String, Table, Text, text
+from sqlalchemy import ARRAY, CheckConstraint, Column, Computed, ForeignKey, Index, Integer, JSON, Numeric, String, Table, Text, text
 from sqlalchemy.sql.sqltypes import NullType
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
@@ -12,6 +12,9 @@ metadata = Base.metadata
 
 class Monument(Base):
     __tablename__ = 'monuments'
+    __table_args__ = (
+        Index('monuments_object_id_idx', 'object_id'),
+    )
 
     id = Column(Integer, primary_key=True)
     object_id = Column(String)
@@ -24,6 +27,8 @@ class Monument(Base):
     postal_code = Column(String)
     place_name = Column(String)
     wkb_geometry = Column(Geometry)
+    geojson = Column(JSON, Computed('ST_AsGeoJSON(wkb_geometry)::json', persisted=True))
+    reason_labels = Column(ARRAY(String))
 
 
 
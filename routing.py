@@ -0,0 +1,102 @@
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter
+
+import asyncio
+import functools
+import hashlib
+
+
+
+def json_schema(schema: dict, media_type: str = 'application/json'):
+    # documents the body of routes that return plain values or a response
+    return {200: {'content': {media_type: {'schema': schema}}}}
+
+
+def dump_orjson(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        content = await endpoint(*args, **kwargs)
+
+        if isinstance(content, Response):
+            return content
+
+        # plain dicts and lists go straight to orjson, skipping jsonable_encoder
+        return ORJSONResponse(content=content)
+
+    return wrapper
+
+
+def dump_json(adapter: TypeAdapter, endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        content = await endpoint(*args, **kwargs)
+
+        if isinstance(content, Response):
+            return content
+
+        # validate and serialize in pydantic-core, no python dicts in between
+        value = adapter.validate_python(content, from_attributes=True)
+
+        return Response(content=adapter.dump_json(value), media_type='application/json')
+
+    return wrapper
+
+
+def cacheable(max_age: int = 86400):
+    def decorator(endpoint):
+        endpoint.cache_control = f'public, max-age={max_age}'
+
+        return endpoint
+
+    return decorator
+
+
+def etag_matches(if_none_match: str, etag: str):
+    # weak comparison over the comma separated entity tags, * matches any
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+
+        if tag.startswith('W/'):
+            tag = tag[2:]
+
+        if tag == '*' or tag == etag:
+            return True
+
+    return False
+
+
+def with_etag(request: Request, response: Response, cache_control: str):
+    if response.status_code != 200:
+        return response
+
+    etag = '"{}"'.format(hashlib.blake2b(response.body, digest_size=16).hexdigest())
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+
+    if etag_matches(request.headers.get('if-none-match', ''), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+
+    return response
+
+
+class SchemaRoute(APIRoute):
+    def get_route_handler(self):
+        if asyncio.iscoroutinefunction(self.dependant.call):
+            if self.response_model is None:
+                self.dependant.call = dump_orjson(self.dependant.call)
+            else:
+                self.dependant.call = dump_json(TypeAdapter(self.response_model), self.dependant.call)
+
+        handler = super().get_route_handler()
+        cache_control = getattr(self.endpoint, 'cache_control', None)
+
+        if cache_control is None:
+            return handler
+
+        async def route_handler(request: Request) -> Response:
+            return with_etag(request, await handler(request), cache_control)
+
+        return route_handler
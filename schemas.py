@@ -1,9 +1,15 @@
-from typing import Optional
-from pydantic import BaseModel
+from typing import Any, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 
 
-class DistrictDetails(BaseModel):
+# responses are validated and dumped by pydantic-core through a TypeAdapter,
+# so every schema has to be a pydantic v2 model readable from attributes
+class Schema(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DistrictDetails(Schema):
     district_name: str
     residents: Optional[int]
     births: int
@@ -52,7 +58,7 @@ class DistrictDetails(BaseModel):
     german_citizenship: int
 
 
-class District(BaseModel):
+class District(Schema):
     district_id: int
     district_name: Optional[str]
 
@@ -61,7 +67,7 @@ class Districts(District):
     districts: list[District]
 
 
-class HouseholdType(BaseModel):
+class HouseholdType(Schema):
     household_id: Optional[int]
     household_type: Optional[str]
 
@@ -70,7 +76,7 @@ class HouseholdTypes(HouseholdType):
     pass
 
 
-class ResidentsByDistrict(BaseModel):
+class ResidentsByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -80,7 +86,7 @@ class ResidentsByDistricts(ResidentsByDistrict):
     pass
 
 
-class BirthsByDistrict(BaseModel):
+class BirthsByDistrict(Schema):
     year: int
     district_id: int
     births: Optional[int]
@@ -91,7 +97,7 @@ class BirthsByDistricts(BirthsByDistrict):
     pass
 
 
-class AgeGroupsOfResidents(BaseModel):
+class AgeGroupsOfResidents(Schema):
     year: int
     age_under_18: Optional[int]
     age_18_to_under_30: Optional[int]
@@ -101,7 +107,7 @@ class AgeGroupsOfResidents(BaseModel):
     age_80_and_above: Optional[int]
 
 
-class AgeRatioByDistrict(BaseModel):
+class AgeRatioByDistrict(Schema):
     year: int
     district_id: int
     quotient: Optional[float]
@@ -111,7 +117,7 @@ class AgeRatioByDistricts(AgeRatioByDistrict):
     pass
 
 
-class AgeGroupsOfResidentsByDistrict(BaseModel):
+class AgeGroupsOfResidentsByDistrict(Schema):
     year: int
     district_id: int
     age_under_18: Optional[int]
@@ -128,7 +134,7 @@ class AgeGroupsOfResidentsByDistrict(AgeGroupsOfResidentsByDistrict):
     pass
 
 
-class ChildrenAgeUnder18ByDistrict(BaseModel):
+class ChildrenAgeUnder18ByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -138,7 +144,7 @@ class ChildrenAgeUnder18ByDistricts(ChildrenAgeUnder18ByDistrict):
     pass
 
 
-class ResidentsAge18ToUnder65ByDistrict(BaseModel):
+class ResidentsAge18ToUnder65ByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -148,7 +154,7 @@ class ResidentsAge18ToUnder65ByDistricts(ResidentsAge18ToUnder65ByDistrict):
     pass
 
 
-class ResidentsAge65AndAboveByDistrict(BaseModel):
+class ResidentsAge65AndAboveByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -158,7 +164,7 @@ class ResidentsAge65AndAboveByDistricts(ResidentsAge65AndAboveByDistrict):
     pass
 
 
-class MigrationBackgroundByDistrict(BaseModel):
+class MigrationBackgroundByDistrict(Schema):
     year: int
     district_id: int
     foreign_citizenship: Optional[int]
@@ -169,7 +175,7 @@ class MigrationBackgroundByDistricts(MigrationBackgroundByDistrict):
     pass
 
 
-class NonGermanNationalsResidenceStatus(BaseModel):
+class NonGermanNationalsResidenceStatus(Schema):
     year: Optional[int]
     permanent_residency: Optional[int]
     permanent_residency_according_eu_freedom_movement_act: Optional[int]
@@ -179,7 +185,7 @@ class NonGermanNationalsResidenceStatus(BaseModel):
     suspension_of_deportation: Optional[int]
 
 
-class EmployedWithPensionInsuranceByDistrict(BaseModel):
+class EmployedWithPensionInsuranceByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -190,7 +196,7 @@ class EmployedWithPensionInsuranceByDistricts(EmployedWithPensionInsuranceByDist
     pass
 
 
-class UnemployedResidentsByDistrict(BaseModel):
+class UnemployedResidentsByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -200,7 +206,7 @@ class UnemployedResidentsByDistricts(UnemployedResidentsByDistrict):
     pass
 
 
-class UnemployedCategorizedResidentsByDistrict(BaseModel):
+class UnemployedCategorizedResidentsByDistrict(Schema):
     year: int
     district_id: Optional[int]
     unemployed_total: Optional[int]
@@ -216,7 +222,7 @@ class UnemployedCategorizedResidentsByDistricts(UnemployedCategorizedResidentsBy
     pass
 
 
-class HousingBenefitByDistrict(BaseModel):
+class HousingBenefitByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -226,7 +232,7 @@ class HousingBenefitByDistricts(HousingBenefitByDistrict):
     pass
 
 
-class HousingAssistanceCasesByDistrict(BaseModel):
+class HousingAssistanceCasesByDistrict(Schema):
     year: int
     district_id: int
     general_consulting: Optional[int]
@@ -242,7 +248,7 @@ class HousingAssistanceCasesByDistricts(HousingAssistanceCasesByDistrict):
     pass
 
 
-class HouseholdsAtRiskOfHomelessnessByDistrict(BaseModel):
+class HouseholdsAtRiskOfHomelessnessByDistrict(Schema):
     year: Optional[int]
     district_id: int
     residents: Optional[int]
@@ -252,7 +258,7 @@ class HouseholdsAtRiskOfHomelessnessByDistricts(HouseholdsAtRiskOfHomelessnessBy
     pass
 
 
-class BeneficiariesAge15ToUnder65ByDistrict(BaseModel):
+class BeneficiariesAge15ToUnder65ByDistrict(Schema):
     year: int
     district_id: Optional[int]
     percentage_of_total_residents: Optional[float]
@@ -266,7 +272,7 @@ class BeneficiariesAge15ToUnder65ByDistricts(BeneficiariesAge15ToUnder65ByDistri
     pass
 
 
-class BeneficiariesByDistrict(BaseModel):
+class BeneficiariesByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -276,7 +282,7 @@ class BeneficiariesByDistricts(BeneficiariesByDistrict):
     pass
 
 
-class BeneficiariesCharacteristicsByDistrict(BaseModel):
+class BeneficiariesCharacteristicsByDistrict(Schema):
     district_id: int
     year: int
     unemployability: Optional[int]
@@ -290,7 +296,7 @@ class BeneficiariesCharacteristicsByDistricts(BeneficiariesCharacteristicsByDist
     pass
 
 
-class InactiveBeneficiariesInHouseholdsByDistrict(BaseModel):
+class InactiveBeneficiariesInHouseholdsByDistrict(Schema):
     year: int
     district_id: int
     residents: Optional[int]
@@ -300,7 +306,7 @@ class InactiveBeneficiariesInHouseholdsByDistricts(InactiveBeneficiariesInHouseh
     pass
 
 
-class BasicBenefitsIncomeByDistrict(BaseModel):
+class BasicBenefitsIncomeByDistrict(Schema):
     year: int
     district_id: int
     male: Optional[int]
@@ -313,13 +319,13 @@ class BasicBenefitsIncomeByDistricts(BasicBenefitsIncomeByDistrict):
     pass
 
 
-class DebtCounselingOfResidents(BaseModel):
+class DebtCounselingOfResidents(Schema):
     year: int
     household_type_id: Optional[int]
     residents: Optional[int]
 
 
-class ChildEducationSupport(BaseModel):
+class ChildEducationSupport(Schema):
     year: int
     educational_assistance: Optional[int]
     parenting_counselor: Optional[int]
@@ -329,3 +335,23 @@ class ChildEducationSupport(BaseModel):
     residential_education: Optional[int]
     integration_assistance: Optional[int]
     additional_support: Optional[int]
+
+
+class BatchRequestItem(BaseModel):
+    id: str
+    method: Literal['GET'] = 'GET'
+    url: str = Field(pattern=r'^/')
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchRequestItem] = Field(min_length=1, max_length=20)
+
+
+class BatchResponseItem(BaseModel):
+    id: str
+    status: int
+    body: Any
+
+
+class BatchResponse(BaseModel):
+    responses: list[BatchResponseItem]